@@ -1,52 +1,302 @@
 import os
-import json
-from typing import Dict, List
+import asyncio
+import hashlib
+import importlib.util
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Tuple
 import logging
-import re
+import orjson
+from cache import TTLCache
+from rate_limiter import AdaptiveLimiter, remaining_requests, retry_after_seconds
 
 logger = logging.getLogger(__name__)
 
 
+# Static recommendation templates for the mock analysis, built once at import
+_PY_RECS = (
+    "Consider using type hints for better code clarity",
+    "Follow PEP 8 style guidelines",
+    "Add error handling with try-except blocks"
+)
+_JS_RECS = (
+    "Use ES6+ features like arrow functions and destructuring",
+    "Add JSDoc comments for better documentation",
+    "Consider using async/await for asynchronous operations"
+)
+_JAVA_RECS = (
+    "Ensure proper exception handling",
+    "Use meaningful variable names",
+    "Follow Java naming conventions"
+)
+_HTML_RECS = (
+    "Add meta tags for better SEO",
+    "Use semantic HTML5 elements",
+    "Ensure accessibility with ARIA labels"
+)
+_CSS_RECS = (
+    "Use CSS variables for maintainability",
+    "Consider using a preprocessor like SASS",
+    "Organize styles with BEM methodology"
+)
+
+
+def _apply_python(code: str, has_comments: bool, out: Dict) -> None:
+    """Mock rules for Python code"""
+    if "import *" in code:
+        out["errors"].append({
+            "type": "style",
+            "message": "Avoid wildcard imports (import *)",
+            "line": "multiple"
+        })
+        out["score"] -= 5
+    
+    if not has_comments:
+        out["recommendations"].append("Add docstrings to functions and classes")
+    
+    if "def " in code:
+        out["strengths"].append("Uses functions for code organization")
+    
+    out["recommendations"].extend(_PY_RECS)
+
+
+def _apply_javascript(code: str, has_comments: bool, out: Dict) -> None:
+    """Mock rules for JavaScript code"""
+    if "var " in code:
+        out["errors"].append({
+            "type": "style",
+            "message": "Use 'const' or 'let' instead of 'var'",
+            "line": "multiple"
+        })
+        out["score"] -= 5
+    
+    if "function" in code:
+        out["strengths"].append("Uses functions for modularity")
+    
+    out["recommendations"].extend(_JS_RECS)
+
+
+def _apply_java(code: str, has_comments: bool, out: Dict) -> None:
+    """Mock rules for Java code"""
+    if "public class" in code:
+        out["strengths"].append("Follows object-oriented principles")
+    
+    out["recommendations"].extend(_JAVA_RECS)
+
+
+def _apply_html(code: str, has_comments: bool, out: Dict) -> None:
+    """Mock rules for HTML code"""
+    if "<!DOCTYPE html>" not in code:
+        out["errors"].append({
+            "type": "structure",
+            "message": "Missing DOCTYPE declaration",
+            "line": "1"
+        })
+        out["score"] -= 5
+    
+    if "<title>" in code:
+        out["strengths"].append("Includes page title")
+    
+    out["recommendations"].extend(_HTML_RECS)
+
+
+def _apply_css(code: str, has_comments: bool, out: Dict) -> None:
+    """Mock rules for CSS code"""
+    out["strengths"].append("Styles are organized")
+    out["recommendations"].extend(_CSS_RECS)
+
+
+def _apply_generic(code: str, has_comments: bool, out: Dict) -> None:
+    """Languages without specific rules only get the generic checks"""
+
+
+# Language-specific rules for the mock analysis
+_LANG_RULES: Dict[str, Callable[[str, bool, Dict], None]] = {
+    "python": _apply_python,
+    "javascript": _apply_javascript,
+    "java": _apply_java,
+    "html": _apply_html,
+    "css": _apply_css
+}
+
+
+def _split_keys(value: str) -> List[str]:
+    """Parse a comma-separated list of API keys"""
+    return [key.strip() for key in (value or "").split(",") if key.strip()]
+
+
+class ClientPool:
+    """Least-loaded dispatch across provider clients, one per API key"""
+    
+    def __init__(self, clients: List[Any], max_concurrency: int):
+        self.clients = clients
+        # Rate limits are per account, so every key gets its own limiter
+        self.limiters = [AdaptiveLimiter(maximum=max_concurrency) for _ in clients]
+        self._in_flight = [0] * len(clients)
+        self._next = 0
+    
+    @contextmanager
+    def acquire(self) -> Iterator[Tuple[Any, AdaptiveLimiter]]:
+        """Borrow the client with the fewest calls in flight"""
+        count = len(self.clients)
+        # Scanning from a rotating start spreads ties round-robin
+        order = ((self._next + i) % count for i in range(count))
+        index = min(order, key=self._in_flight.__getitem__)
+        self._next = (index + 1) % count
+        
+        self._in_flight[index] += 1
+        try:
+            yield self.clients[index], self.limiters[index]
+        finally:
+            self._in_flight[index] -= 1
+
+
 class AICodeAnalyzer:
     """AI-powered code analyzer with mock and real LLM support"""
     
     def __init__(self):
-        self.api_key = os.getenv("OPENAI_API_KEY") or os.getenv("ANTHROPIC_API_KEY")
-        self.use_real_llm = bool(self.api_key)
+        # Several comma-separated keys may be given to spread load across accounts
+        openai_keys = _split_keys(os.getenv("OPENAI_API_KEYS") or os.getenv("OPENAI_API_KEY"))
+        anthropic_keys = _split_keys(os.getenv("ANTHROPIC_API_KEYS") or os.getenv("ANTHROPIC_API_KEY"))
+        self.use_real_llm = bool(openai_keys or anthropic_keys)
+        
+        # Async clients are created once and reused so their connection pools
+        # survive across requests and never block the event loop
+        # SDK-level retries are disabled so throttling is visible to the limiter
+        self.provider = None
+        self._clients = None
+        self._sdk = None
+        self._http = None
+        self.model = "mock"
+        max_concurrency = int(os.getenv("LLM_MAX_CONCURRENCY", "32"))
+        try:
+            if openai_keys or anthropic_keys:
+                # One keep-alive connection pool shared by every provider client;
+                # HTTP/2 multiplexes concurrent calls when h2 is installed
+                import httpx
+                self._http = httpx.AsyncClient(
+                    http2=importlib.util.find_spec("h2") is not None,
+                    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+                )
+            
+            if openai_keys:
+                import openai
+                self._sdk = openai
+                self._clients = ClientPool(
+                    [openai.AsyncOpenAI(api_key=key, max_retries=0, http_client=self._http) for key in openai_keys],
+                    max_concurrency
+                )
+                self.provider = "openai"
+                self.model = "gpt-3.5-turbo"
+            elif anthropic_keys:
+                import anthropic
+                self._sdk = anthropic
+                self._clients = ClientPool(
+                    [anthropic.AsyncAnthropic(api_key=key, max_retries=0, http_client=self._http) for key in anthropic_keys],
+                    max_concurrency
+                )
+                self.provider = "anthropic"
+                self.model = "claude-3-sonnet-20240229"
+        except ImportError as e:
+            # The LLM SDKs are optional; without them the mock engine is used
+            logger.error(f"LLM client unavailable: {e}")
+            self.use_real_llm = False
+        
+        # Identical submissions are common in tutoring workloads, so analyses
+        # are memoized by (code hash, language, model)
+        self._cache = TTLCache(
+            maxsize=int(os.getenv("AI_CACHE_SIZE", "4096")),
+            ttl=float(os.getenv("AI_CACHE_TTL", "86400"))
+        )
+        
+        self.max_retries = int(os.getenv("LLM_MAX_RETRIES", "3"))
+        
+        # Code sent to the LLM is capped so large files cannot blow the context
+        # window or the token budget
+        self.max_code_tokens = int(os.getenv("MAX_CODE_TOKENS", "3000"))
+        self._encoding = self._load_encoding() if self.use_real_llm else None
         
         if self.use_real_llm:
             logger.info("AI Engine: Using real LLM")
         else:
             logger.info("AI Engine: Using mock responses")
     
+    async def aclose(self) -> None:
+        """Close the shared HTTP connection pool"""
+        if self._http is not None:
+            await self._http.aclose()
+    
     async def analyze_code(self, code: str, language: str, filename: str) -> Dict:
         """Main analysis method"""
+        key = self._cache_key(code, language)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        
         if self.use_real_llm:
-            return await self._analyze_with_llm(code, language, filename)
-        else:
-            return self._mock_analysis(code, language, filename)
+            return await self._analyze_with_llm(code, language, filename, key)
+        
+        result = self._mock_analysis(code, language, filename)
+        self._cache.set(key, result)
+        return result
     
-    async def _analyze_with_llm(self, code: str, language: str, filename: str) -> Dict:
+    def _cache_key(self, code: str, language: str) -> str:
+        """Content-addressed cache key for an analysis"""
+        digest = hashlib.blake2b(code.encode('utf-8'), digest_size=16).hexdigest()
+        return f"{digest}:{language}:{self.model}"
+    
+    async def _analyze_with_llm(self, code: str, language: str, filename: str, key: str) -> Dict:
         """Real LLM analysis using OpenAI or Claude"""
         try:
-            if os.getenv("OPENAI_API_KEY"):
-                return await self._openai_analysis(code, language)
-            elif os.getenv("ANTHROPIC_API_KEY"):
-                return await self._claude_analysis(code, language)
+            if self.provider == "openai":
+                result = await self._openai_analysis(code, language)
+            else:
+                result = await self._claude_analysis(code, language)
         except Exception as e:
+            # Fallbacks are not cached so the LLM is retried on the next request
             logger.error(f"LLM analysis failed: {e}")
-            return self._mock_analysis(code, language, filename)
+            result = self._mock_analysis(code, language, filename)
+            result["fallback"] = True
+            return result
+        
+        # Replies the API cannot validate fall back to the mock analysis
+        if not self._is_well_formed(result):
+            logger.error("LLM analysis failed: reply does not match the expected schema")
+            result = self._mock_analysis(code, language, filename)
+            result["fallback"] = True
+        
+        # Stand-in replies are not cached, so the LLM is asked again
+        if not result.get("fallback"):
+            self._cache.set(key, result)
+        return result
+    
+    def _is_well_formed(self, result: Dict) -> bool:
+        """Check a parsed reply has the field types AnalysisResponse accepts"""
+        errors = result.get("errors", [])
+        if not isinstance(errors, list) or not all(
+            isinstance(error, dict) and all(isinstance(value, str) for value in error.values())
+            for error in errors
+        ):
+            return False
+        
+        score = result.get("score", 75)
+        if not isinstance(score, int) or isinstance(score, bool):
+            return False
+        
+        for field in ("recommendations", "strengths"):
+            items = result.get(field, [])
+            if not isinstance(items, list) or not all(isinstance(item, str) for item in items):
+                return False
+        
+        return isinstance(result.get("summary", ""), str)
     
     async def _openai_analysis(self, code: str, language: str) -> Dict:
         """OpenAI GPT analysis"""
-        try:
-            import openai
-            openai.api_key = os.getenv("OPENAI_API_KEY")
-            
-            prompt = self._create_analysis_prompt(code, language)
-            
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
+        prompt = self._create_analysis_prompt(code, language)
+        
+        response = await self._call_llm(
+            lambda client: client.chat.completions.with_raw_response.create(
+                model=self.model,
                 messages=[
                     {"role": "system", "content": "You are an expert code reviewer and tutor."},
                     {"role": "user", "content": prompt}
@@ -54,39 +304,105 @@ class AICodeAnalyzer:
                 temperature=0.7,
                 max_tokens=1000
             )
-            
-            result = response.choices[0].message.content
-            return self._parse_llm_response(result)
-            
-        except Exception as e:
-            logger.error(f"OpenAI error: {e}")
-            return self._mock_analysis(code, language, "file")
+        )
+        
+        result = response.choices[0].message.content
+        return self._parse_llm_response(result)
     
     async def _claude_analysis(self, code: str, language: str) -> Dict:
         """Claude API analysis"""
-        try:
-            import anthropic
-            
-            client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-            prompt = self._create_analysis_prompt(code, language)
-            
-            message = client.messages.create(
-                model="claude-3-sonnet-20240229",
+        prompt = self._create_analysis_prompt(code, language)
+        
+        message = await self._call_llm(
+            lambda client: client.messages.with_raw_response.create(
+                model=self.model,
                 max_tokens=1000,
                 messages=[
                     {"role": "user", "content": prompt}
                 ]
             )
+        )
+        
+        result = message.content[0].text
+        return self._parse_llm_response(result)
+    
+    async def _call_llm(self, create: Callable[[Any], Awaitable[Any]]) -> Any:
+        """
+        Make a raw provider call on the least-loaded client, under that
+        client's adaptive concurrency limit
+        
+        Throttled and transient failures are retried with exponential backoff,
+        honouring the provider's retry-after header when present.
+        
+        Args:
+            create: Coroutine factory taking a client and returning a raw SDK response
             
-            result = message.content[0].text
-            return self._parse_llm_response(result)
+        Returns:
+            The parsed SDK response object
+        """
+        for attempt in range(self.max_retries + 1):
+            with self._clients.acquire() as (client, limiter):
+                async with limiter.slot():
+                    started = time.monotonic()
+                    try:
+                        raw = await create(client)
+                    except Exception as e:
+                        if attempt == self.max_retries or not self._is_retryable(e):
+                            raise
+                        response = getattr(e, "response", None)
+                        retry_after = retry_after_seconds(getattr(response, "headers", None))
+                        if getattr(e, "status_code", None) == 429:
+                            limiter.record_throttle(retry_after)
+                        logger.warning(f"LLM call failed (attempt {attempt + 1}), retrying: {e}")
+                    else:
+                        limiter.record_success(
+                            time.monotonic() - started,
+                            remaining_requests(raw.headers)
+                        )
+                        return raw.parse()
             
+            await asyncio.sleep(retry_after if retry_after is not None else 2 ** attempt)
+    
+    def _is_retryable(self, error: Exception) -> bool:
+        """Rate limits, timeouts, conflicts and server errors are worth retrying"""
+        if isinstance(error, self._sdk.APIConnectionError):
+            return True
+        if isinstance(error, self._sdk.APIStatusError):
+            return error.status_code in (408, 409, 429) or error.status_code >= 500
+        return False
+    
+    def _load_encoding(self):
+        """
+        Load the tiktoken encoder at startup; it may download its BPE file on
+        first use, which must not happen on the request path
+        """
+        try:
+            import tiktoken
+            return tiktoken.encoding_for_model("gpt-3.5-turbo")
         except Exception as e:
-            logger.error(f"Claude error: {e}")
-            return self._mock_analysis(code, language, "file")
+            logger.warning(f"tiktoken unavailable, estimating tokens from length: {e}")
+            return None
+    
+    def _truncate_code(self, code: str) -> str:
+        """Keep the head and tail of code within the prompt token budget"""
+        marker = "\n... [truncated] ...\n"
+        # At least one token from each end, so code[-half:] never spans the whole input
+        half = max(1, self.max_code_tokens // 2)
+        
+        if self._encoding is None:
+            # Source code averages roughly four characters per token
+            if len(code) <= self.max_code_tokens * 4:
+                return code
+            return code[:half * 4] + marker + code[-half * 4:]
+        
+        tokens = self._encoding.encode(code, disallowed_special=())
+        if len(tokens) <= self.max_code_tokens:
+            return code
+        return self._encoding.decode(tokens[:half]) + marker + self._encoding.decode(tokens[-half:])
     
     def _create_analysis_prompt(self, code: str, language: str) -> str:
         """Create analysis prompt for LLM"""
+        code = self._truncate_code(code)
         return f"""Analyze this {language} code and provide:
 
 1. Errors or issues (if any)
@@ -102,7 +418,7 @@ Code:
 
 Respond in JSON format:
 {{
-    "errors": [list of error descriptions],
+    "errors": [{{"type": "error category", "message": "description", "line": "line number as a string, or N/A"}}],
     "score": integer from 0-100,
     "recommendations": [list of recommendations],
     "strengths": [list of strengths],
@@ -112,10 +428,20 @@ Respond in JSON format:
     def _parse_llm_response(self, response: str) -> Dict:
         """Parse LLM response into structured format"""
         try:
-            # Try to extract JSON from response
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
+            # Try to extract JSON from response: the outermost {...} span
+            start = response.find('{')
+            end = response.rfind('}')
+            if start != -1 and end > start:
+                result = orjson.loads(response[start:end + 1])
+                
+                # Errors given as plain descriptions are wrapped in the API's error shape
+                errors = result.get("errors")
+                if isinstance(errors, list):
+                    result["errors"] = [
+                        {"type": "general", "message": error, "line": "N/A"} if isinstance(error, str) else error
+                        for error in errors
+                    ]
+                return result
             else:
                 # Fallback parsing
                 return {
@@ -123,7 +449,8 @@ Respond in JSON format:
                     "score": 75,
                     "recommendations": [response[:200]],
                     "strengths": ["Code is readable"],
-                    "summary": response[:150]
+                    "summary": response[:150],
+                    "fallback": True
                 }
         except Exception as e:
             logger.error(f"Parse error: {e}")
@@ -132,11 +459,10 @@ Respond in JSON format:
     def _mock_analysis(self, code: str, language: str, filename: str) -> Dict:
         """Mock analysis when no API key is available"""
         
-        # Simple heuristics
-        lines = code.split('\n')
-        num_lines = len(lines)
-        has_comments = any('#' in line or '//' in line or '/*' in line for line in lines)
-        avg_line_length = sum(len(line) for line in lines) / max(num_lines, 1)
+        # Simple heuristics, computed with str methods instead of splitting lines
+        num_lines = code.count('\n') + 1
+        has_comments = '#' in code or '//' in code or '/*' in code
+        avg_line_length = (len(code) - (num_lines - 1)) / num_lines
         
         # Calculate base score
         score = 70
@@ -148,85 +474,20 @@ Respond in JSON format:
         if avg_line_length < 100:
             score += 5
         
-        errors = []
-        recommendations = []
-        strengths = []
+        out = {
+            "errors": [],
+            "recommendations": [],
+            "strengths": [],
+            "score": score
+        }
         
         # Language-specific mock analysis
-        if language == "python":
-            if "import *" in code:
-                errors.append({
-                    "type": "style",
-                    "message": "Avoid wildcard imports (import *)",
-                    "line": "multiple"
-                })
-                score -= 5
-            
-            if not has_comments:
-                recommendations.append("Add docstrings to functions and classes")
-            
-            if "def " in code:
-                strengths.append("Uses functions for code organization")
-            
-            recommendations.extend([
-                "Consider using type hints for better code clarity",
-                "Follow PEP 8 style guidelines",
-                "Add error handling with try-except blocks"
-            ])
-        
-        elif language == "javascript":
-            if "var " in code:
-                errors.append({
-                    "type": "style",
-                    "message": "Use 'const' or 'let' instead of 'var'",
-                    "line": "multiple"
-                })
-                score -= 5
-            
-            if "function" in code:
-                strengths.append("Uses functions for modularity")
-            
-            recommendations.extend([
-                "Use ES6+ features like arrow functions and destructuring",
-                "Add JSDoc comments for better documentation",
-                "Consider using async/await for asynchronous operations"
-            ])
-        
-        elif language == "java":
-            if "public class" in code:
-                strengths.append("Follows object-oriented principles")
-            
-            recommendations.extend([
-                "Ensure proper exception handling",
-                "Use meaningful variable names",
-                "Follow Java naming conventions"
-            ])
-        
-        elif language == "html":
-            if "<!DOCTYPE html>" not in code:
-                errors.append({
-                    "type": "structure",
-                    "message": "Missing DOCTYPE declaration",
-                    "line": "1"
-                })
-                score -= 5
-            
-            if "<title>" in code:
-                strengths.append("Includes page title")
-            
-            recommendations.extend([
-                "Add meta tags for better SEO",
-                "Use semantic HTML5 elements",
-                "Ensure accessibility with ARIA labels"
-            ])
-        
-        elif language == "css":
-            strengths.append("Styles are organized")
-            recommendations.extend([
-                "Use CSS variables for maintainability",
-                "Consider using a preprocessor like SASS",
-                "Organize styles with BEM methodology"
-            ])
+        _LANG_RULES.get(language, _apply_generic)(code, has_comments, out)
+        
+        errors = out["errors"]
+        recommendations = out["recommendations"]
+        strengths = out["strengths"]
+        score = out["score"]
         
         # Generic recommendations
         if num_lines < 10:
@@ -261,5 +522,6 @@ Respond in JSON format:
             "score": 75,
             "recommendations": ["Review code structure and organization"],
             "strengths": ["Code is functional"],
-            "summary": "Analysis completed with default scoring."
+            "summary": "Analysis completed with default scoring.",
+            "fallback": True
         }
\ No newline at end of file
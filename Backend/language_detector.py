@@ -1,5 +1,189 @@
 import re
-from typing import Optional
+from typing import Callable, Optional
+
+try:
+    # Optional accelerator: matches every content pattern in one vectorized pass
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+
+# Content-detection patterns, compiled once at import
+_PYTHON_RE = re.compile(r'def\s+\w+\s*\(|import\s+\w+|from\s+\w+\s+import')
+_JAVASCRIPT_RE = re.compile(r'function\s+\w+|const\s+\w+\s*=|let\s+\w+\s*=|var\s+\w+')
+_JAVA_RE = re.compile(r'public\s+class\s+\w+|private\s+\w+|import\s+java\.')
+_CSHARP_RE = re.compile(r'using\s+System|namespace\s+\w+|public\s+class\s+\w+.*\{')
+_DART_RE = re.compile(r'import\s+[\'"]package:flutter|void\s+main\s*\(\)')
+_HTML_RE = re.compile(r'<!DOCTYPE\s+html|<html|<head>|<body>', re.IGNORECASE)
+_CSS_RE = re.compile(r'\{[^}]*:\s*[^;]+;|^\s*\.\w+\s*\{|^\s*#\w+\s*\{', re.MULTILINE)
+_PHP_VAR_RE = re.compile(r'\$\w+\s*=')
+_RUBY_RE = re.compile(r'def\s+\w+|require\s+[\'"]|class\s+\w+\s*<')
+_GO_RE = re.compile(r'package\s+main|func\s+\w+|import\s+\(')
+_SQL_RE = re.compile(r'SELECT\s+.*FROM|CREATE\s+TABLE|INSERT\s+INTO', re.IGNORECASE)
+
+# Literals at least one of which must be present for the matching check to
+# succeed; plain substring tests rule a language out before its regex runs
+_PYTHON_HINTS = ('def', 'import')
+_JAVASCRIPT_HINTS = ('function', 'const', 'let', 'var')
+_JAVA_HINTS = ('class', 'private', 'import')
+_CSHARP_HINTS = ('using System', 'namespace')
+_DART_HINTS = ('package:flutter', 'main')
+_RUBY_HINTS = ('require', 'puts')
+_GO_HINTS = ('package', 'func', 'import')
+
+# Content rules in detection priority order: (pattern, hints or None)
+_CONTENT_RULES = (
+    (_PYTHON_RE, _PYTHON_HINTS),
+    (_JAVASCRIPT_RE, _JAVASCRIPT_HINTS),
+    (_JAVA_RE, _JAVA_HINTS),
+    (_CSHARP_RE, _CSHARP_HINTS),
+    (_DART_RE, _DART_HINTS),
+    (_HTML_RE, ('<',)),
+    (_CSS_RE, ('{',)),
+    (_PHP_VAR_RE, ('$',)),
+    (_RUBY_RE, _RUBY_HINTS),
+    (_GO_RE, _GO_HINTS),
+    (_SQL_RE, None)
+)
+(_PYTHON, _JAVASCRIPT, _JAVA, _CSHARP, _DART, _HTML,
+ _CSS, _PHP, _RUBY, _GO, _SQL) = range(len(_CONTENT_RULES))
+
+
+def _build_hyperscan_db():
+    """Compile all content rules into one Hyperscan database, ids = rule index"""
+    flags = []
+    for pattern, _ in _CONTENT_RULES:
+        flag = hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+        if pattern.flags & re.IGNORECASE:
+            flag |= hyperscan.HS_FLAG_CASELESS
+        if pattern.flags & re.MULTILINE:
+            flag |= hyperscan.HS_FLAG_MULTILINE
+        flags.append(flag)
+    
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[pattern.pattern.encode('utf-8') for pattern, _ in _CONTENT_RULES],
+        ids=list(range(len(_CONTENT_RULES))),
+        elements=len(_CONTENT_RULES),
+        flags=flags
+    )
+    return db
+
+
+_HYPERSCAN_DB = _build_hyperscan_db() if hyperscan is not None else None
+
+
+# Extension-based lookup table
+_EXTENSION_MAP = {
+    'py': 'python',
+    'js': 'javascript',
+    'jsx': 'javascript',
+    'ts': 'typescript',
+    'tsx': 'typescript',
+    'java': 'java',
+    'dart': 'dart',
+    'html': 'html',
+    'htm': 'html',
+    'css': 'css',
+    'scss': 'scss',
+    'cs': 'csharp',
+    'cpp': 'cpp',
+    'c': 'c',
+    'php': 'php',
+    'rb': 'ruby',
+    'go': 'go',
+    'rs': 'rust',
+    'swift': 'swift',
+    'kt': 'kotlin',
+    'sql': 'sql',
+    'sh': 'shell',
+    'bash': 'shell',
+    'json': 'json',
+    'xml': 'xml',
+    'yaml': 'yaml',
+    'yml': 'yaml'
+}
+
+# Descriptive metadata per language
+_INFO_MAP = {
+    'python': {
+        'name': 'Python',
+        'type': 'interpreted',
+        'paradigm': 'multi-paradigm',
+        'extensions': ['.py']
+    },
+    'javascript': {
+        'name': 'JavaScript',
+        'type': 'interpreted',
+        'paradigm': 'multi-paradigm',
+        'extensions': ['.js', '.jsx']
+    },
+    'typescript': {
+        'name': 'TypeScript',
+        'type': 'compiled to JavaScript',
+        'paradigm': 'multi-paradigm',
+        'extensions': ['.ts', '.tsx']
+    },
+    'java': {
+        'name': 'Java',
+        'type': 'compiled',
+        'paradigm': 'object-oriented',
+        'extensions': ['.java']
+    },
+    'dart': {
+        'name': 'Dart',
+        'type': 'compiled',
+        'paradigm': 'object-oriented',
+        'extensions': ['.dart']
+    },
+    'csharp': {
+        'name': 'C#',
+        'type': 'compiled',
+        'paradigm': 'object-oriented',
+        'extensions': ['.cs']
+    },
+    'html': {
+        'name': 'HTML',
+        'type': 'markup',
+        'paradigm': 'declarative',
+        'extensions': ['.html', '.htm']
+    },
+    'css': {
+        'name': 'CSS',
+        'type': 'stylesheet',
+        'paradigm': 'declarative',
+        'extensions': ['.css']
+    }
+}
+
+
+def _contains_any(code: str, hints: tuple) -> bool:
+    """Check whether any of the literal hints occurs in code"""
+    return any(hint in code for hint in hints)
+
+
+def _content_matcher(code: str) -> Callable[[int], bool]:
+    """
+    Build a predicate telling whether the content rule at an index matches
+    
+    With Hyperscan every pattern is matched in a single scan up front;
+    otherwise each rule's regex runs on demand behind its literal hints.
+    """
+    if _HYPERSCAN_DB is not None:
+        hits = set()
+        _HYPERSCAN_DB.scan(
+            code.encode('utf-8', 'replace'),
+            match_event_handler=lambda rule, *_: hits.add(rule)
+        )
+        found = hits.__contains__
+    else:
+        found = lambda rule: _CONTENT_RULES[rule][0].search(code) is not None
+    
+    def matches(rule: int) -> bool:
+        hints = _CONTENT_RULES[rule][1]
+        return (hints is None or _contains_any(code, hints)) and found(rule)
+    
+    return matches
 
 
 def detect_language(filename: str, code: str) -> str:
@@ -15,43 +199,11 @@ def detect_language(filename: str, code: str) -> str:
     """
     
     # Extension-based detection (primary method)
-    extension = filename.split('.')[-1].lower() if '.' in filename else ''
-    
-    extension_map = {
-        'py': 'python',
-        'js': 'javascript',
-        'jsx': 'javascript',
-        'ts': 'typescript',
-        'tsx': 'typescript',
-        'java': 'java',
-        'dart': 'dart',
-        'html': 'html',
-        'htm': 'html',
-        'css': 'css',
-        'scss': 'scss',
-        'cs': 'csharp',
-        'cpp': 'cpp',
-        'c': 'c',
-        'php': 'php',
-        'rb': 'ruby',
-        'go': 'go',
-        'rs': 'rust',
-        'swift': 'swift',
-        'kt': 'kotlin',
-        'sql': 'sql',
-        'sh': 'shell',
-        'bash': 'shell',
-        'json': 'json',
-        'xml': 'xml',
-        'yaml': 'yaml',
-        'yml': 'yaml'
-    }
-    
-    if extension in extension_map:
-        return extension_map[extension]
+    _, dot, extension = filename.rpartition('.')
+    language = _EXTENSION_MAP.get(extension.lower()) if dot else None
     
     # Content-based detection (fallback)
-    return detect_language_from_content(code)
+    return language or detect_language_from_content(code)
 
 
 def detect_language_from_content(code: str) -> str:
@@ -65,54 +217,52 @@ def detect_language_from_content(code: str) -> str:
         Detected language name
     """
     
-    code_lower = code.lower()
+    matches = _content_matcher(code)
     
     # Python patterns
-    if re.search(r'def\s+\w+\s*\(|import\s+\w+|from\s+\w+\s+import', code):
+    if matches(_PYTHON):
         return 'python'
     
     # JavaScript/TypeScript patterns
-    if re.search(r'function\s+\w+|const\s+\w+\s*=|let\s+\w+\s*=|var\s+\w+', code):
-        if 'interface' in code_lower or ': string' in code or ': number' in code:
+    if matches(_JAVASCRIPT):
+        if 'interface' in code.lower() or ': string' in code or ': number' in code:
             return 'typescript'
         return 'javascript'
     
     # Java patterns
-    if re.search(r'public\s+class\s+\w+|private\s+\w+|import\s+java\.', code):
+    if matches(_JAVA):
         return 'java'
     
     # C# patterns
-    if re.search(r'using\s+System|namespace\s+\w+|public\s+class\s+\w+.*\{', code):
-        if 'using System' in code or 'namespace' in code:
-            return 'csharp'
+    if matches(_CSHARP):
+        return 'csharp'
     
     # Dart/Flutter patterns
-    if re.search(r'import\s+[\'"]package:flutter|void\s+main\s*\(\)', code):
+    if matches(_DART):
         return 'dart'
     
     # HTML patterns
-    if re.search(r'<!DOCTYPE\s+html|<html|<head>|<body>', code_lower):
+    if matches(_HTML):
         return 'html'
     
     # CSS patterns
-    if re.search(r'\{[^}]*:\s*[^;]+;|^\s*\.\w+\s*\{|^\s*#\w+\s*\{', code, re.MULTILINE):
+    if matches(_CSS):
         return 'css'
     
     # PHP patterns
-    if '<?php' in code_lower or re.search(r'\$\w+\s*=', code):
+    if ('<?' in code and '<?php' in code.lower()) or matches(_PHP):
         return 'php'
     
     # Ruby patterns
-    if re.search(r'def\s+\w+|require\s+[\'"]|class\s+\w+\s*<', code):
-        if 'require' in code or 'puts' in code:
-            return 'ruby'
+    if matches(_RUBY):
+        return 'ruby'
     
     # Go patterns
-    if re.search(r'package\s+main|func\s+\w+|import\s+\(', code):
+    if matches(_GO):
         return 'go'
     
     # SQL patterns
-    if re.search(r'SELECT\s+.*FROM|CREATE\s+TABLE|INSERT\s+INTO', code_lower):
+    if matches(_SQL):
         return 'sql'
     
     # Default
@@ -130,60 +280,14 @@ def get_language_info(language: str) -> dict:
         Dictionary with language information
     """
     
-    info_map = {
-        'python': {
-            'name': 'Python',
-            'type': 'interpreted',
-            'paradigm': 'multi-paradigm',
-            'extensions': ['.py']
-        },
-        'javascript': {
-            'name': 'JavaScript',
-            'type': 'interpreted',
-            'paradigm': 'multi-paradigm',
-            'extensions': ['.js', '.jsx']
-        },
-        'typescript': {
-            'name': 'TypeScript',
-            'type': 'compiled to JavaScript',
-            'paradigm': 'multi-paradigm',
-            'extensions': ['.ts', '.tsx']
-        },
-        'java': {
-            'name': 'Java',
-            'type': 'compiled',
-            'paradigm': 'object-oriented',
-            'extensions': ['.java']
-        },
-        'dart': {
-            'name': 'Dart',
-            'type': 'compiled',
-            'paradigm': 'object-oriented',
-            'extensions': ['.dart']
-        },
-        'csharp': {
-            'name': 'C#',
-            'type': 'compiled',
-            'paradigm': 'object-oriented',
-            'extensions': ['.cs']
-        },
-        'html': {
-            'name': 'HTML',
-            'type': 'markup',
-            'paradigm': 'declarative',
-            'extensions': ['.html', '.htm']
-        },
-        'css': {
-            'name': 'CSS',
-            'type': 'stylesheet',
-            'paradigm': 'declarative',
-            'extensions': ['.css']
+    info = _INFO_MAP.get(language)
+    if info is None:
+        return {
+            'name': language.title(),
+            'type': 'unknown',
+            'paradigm': 'unknown',
+            'extensions': []
         }
-    }
     
-    return info_map.get(language, {
-        'name': language.title(),
-        'type': 'unknown',
-        'paradigm': 'unknown',
-        'extensions': []
-    })
\ No newline at end of file
+    # Callers get their own copy, so changing it cannot alter the shared table
+    return {**info, 'extensions': list(info['extensions'])}
\ No newline at end of file
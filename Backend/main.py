@@ -1,9 +1,18 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Dict, Optional
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
+from typing import List, Dict, Optional, Tuple
+import asyncio
+import hashlib
 import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from ai_engine import AICodeAnalyzer
+from cache import TTLCache
 from language_detector import detect_language
 from static_analyzer import StaticAnalyzer
 
@@ -11,10 +20,21 @@ from static_analyzer import StaticAnalyzer
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release the LLM clients and the static analysis pool on shutdown"""
+    yield
+    await ai_analyzer.aclose()
+    cpu_pool.shutdown(wait=False)
+
+
 app = FastAPI(
     title="AI Tutor Platform API",
     description="Code analysis and tutoring API",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -26,12 +46,48 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Verbose LLM feedback compresses well; small responses are sent as-is
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 # Initialize analyzers
 ai_analyzer = AICodeAnalyzer()
 static_analyzer = StaticAnalyzer()
 
+# Static analysis is synchronous CPU work, so it runs off the event loop
+cpu_pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+# Request-level cap on analyses running at once, across every endpoint;
+# cached results are served without taking a slot. The per-key adaptive
+# limit on provider calls (LLM_MAX_CONCURRENCY) is applied in ai_engine.
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "10"))
+_llm_semaphore: Optional[asyncio.Semaphore] = None
+
+# Uploads are read in chunks and rejected once they exceed this size
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(1024 * 1024)))
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Batches with more files are rejected before any upload is read
+MAX_BATCH_FILES = int(os.getenv("MAX_BATCH_FILES", "20"))
+
+# Byte-identical submissions (common for class assignments) are served from here
+result_cache = TTLCache(
+    maxsize=int(os.getenv("RESULT_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("RESULT_CACHE_TTL", "3600"))
+)
+
+# Background analyses started by /submit and polled through /status/{job_id}
+jobs = TTLCache(
+    maxsize=int(os.getenv("JOB_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("JOB_TTL", "3600"))
+)
+# Strong references keep running job tasks from being garbage collected
+job_tasks = set()
+
 
 class AnalysisResponse(BaseModel):
+    # Instances are shared through the result cache, so they are immutable
+    model_config = ConfigDict(frozen=True)
+    
     language: str
     errors: List[Dict[str, str]]
     recommendations: List[str]
@@ -41,12 +97,30 @@ class AnalysisResponse(BaseModel):
     grade: str
 
 
+class BatchItemResult(BaseModel):
+    filename: str
+    result: Optional[AnalysisResponse] = None
+    error: Optional[str] = None
+
+
+class BatchAnalysisResponse(BaseModel):
+    results: List[BatchItemResult]
+
+
+class JobStatus(BaseModel):
+    job_id: str
+    status: str  # "pending", "done" or "failed"
+    result: Optional[AnalysisResponse] = None
+    results: Optional[List[BatchItemResult]] = None  # set by /submit-batch jobs
+    error: Optional[str] = None
+
+
 @app.get("/")
 async def root():
     return {
         "message": "AI Tutor Platform API",
         "version": "1.0.0",
-        "endpoints": ["/health", "/analyze-code"]
+        "endpoints": ["/health", "/analyze-code", "/analyze-batch", "/submit", "/submit-batch", "/status/{job_id}"]
     }
 
 
@@ -71,47 +145,14 @@ async def analyze_code(file: UploadFile = File(...)):
     - Returns score, errors, and recommendations
     """
     try:
-        # Read file content
-        content = await file.read()
-        code = content.decode('utf-8')
-        
-        logger.info(f"Analyzing file: {file.filename}")
-        
-        # Detect language
-        language = detect_language(file.filename, code)
-        logger.info(f"Detected language: {language}")
-        
-        # Perform static analysis
-        static_results = static_analyzer.analyze(code, language)
-        
-        # AI-powered analysis
-        ai_results = await ai_analyzer.analyze_code(
-            code=code,
-            language=language,
-            filename=file.filename
-        )
-        
-        # Merge results
-        errors = static_results.get("errors", []) + ai_results.get("errors", [])
-        recommendations = static_results.get("recommendations", []) + ai_results.get("recommendations", [])
+        response = await analyze_upload(file)
         
-        # Calculate final score
-        score = calculate_score(errors, ai_results.get("score", 75))
-        grade = get_grade(score)
-        
-        response = AnalysisResponse(
-            language=language,
-            errors=errors[:10],  # Limit to top 10 errors
-            recommendations=recommendations[:8],  # Limit to top 8 recommendations
-            score=score,
-            analysis_summary=ai_results.get("summary", "Code analysis completed."),
-            strengths=ai_results.get("strengths", [])[:5],
-            grade=grade
-        )
-        
-        logger.info(f"Analysis complete. Score: {score}/100")
-        return response
+        # The model was validated when built; returning a Response directly
+        # skips FastAPI's dump / re-validate / encode pass for response_model
+        return ORJSONResponse(response.model_dump())
         
+    except HTTPException:
+        raise
     except UnicodeDecodeError:
         raise HTTPException(
             status_code=400,
@@ -125,6 +166,247 @@ async def analyze_code(file: UploadFile = File(...)):
         )
 
 
+@app.post("/analyze-batch", response_model=BatchAnalysisResponse)
+async def analyze_batch(files: List[UploadFile] = File(...)):
+    """
+    Analyze several uploaded code files concurrently
+    
+    - Runs up to LLM_CONCURRENCY analyses at a time
+    - A failing file is reported in its own entry without affecting the rest
+    """
+    check_batch_size(files)
+    
+    outcomes = await asyncio.gather(
+        *(analyze_upload(file) for file in files),
+        return_exceptions=True
+    )
+    
+    results = [batch_item(file.filename, outcome) for file, outcome in zip(files, outcomes)]
+    return ORJSONResponse(BatchAnalysisResponse(results=results).model_dump())
+
+
+@app.post("/submit", response_model=JobStatus)
+async def submit_analysis(file: UploadFile = File(...)):
+    """
+    Start analyzing an uploaded code file in the background
+    
+    - Returns a job id at once; poll /status/{job_id} for the outcome
+    - Byte-identical submissions complete immediately from the result cache
+    """
+    content = await read_upload(file)
+    job_id = uuid.uuid4().hex
+    
+    cache_key = result_cache_key(file.filename, content)
+    cached = result_cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"Serving cached analysis for: {file.filename}")
+        job = JobStatus(job_id=job_id, status="done", result=cached)
+    else:
+        try:
+            code = content.decode('utf-8')
+        except UnicodeDecodeError:
+            raise HTTPException(
+                status_code=400,
+                detail="File encoding error. Please upload a valid text file."
+            )
+        
+        job = JobStatus(job_id=job_id, status="pending")
+        task = asyncio.create_task(run_job(job_id, file.filename, code, cache_key))
+        job_tasks.add(task)
+        task.add_done_callback(job_tasks.discard)
+    
+    jobs.set(job_id, job)
+    return ORJSONResponse(job.model_dump())
+
+
+@app.post("/submit-batch", response_model=JobStatus)
+async def submit_batch(files: List[UploadFile] = File(...)):
+    """
+    Start analyzing several uploaded code files in the background
+    
+    - Returns one job id for the batch; poll /status/{job_id} for the outcome
+    - The finished job lists one entry per file, in upload order
+    """
+    check_batch_size(files)
+    
+    # Uploads are read now, as they are closed once this request returns
+    contents = await asyncio.gather(
+        *(read_upload(file) for file in files),
+        return_exceptions=True
+    )
+    filenames = [file.filename for file in files]
+    job_id = uuid.uuid4().hex
+    
+    job = JobStatus(job_id=job_id, status="pending")
+    task = asyncio.create_task(run_batch_job(job_id, filenames, contents))
+    job_tasks.add(task)
+    task.add_done_callback(job_tasks.discard)
+    
+    jobs.set(job_id, job)
+    return ORJSONResponse(job.model_dump())
+
+
+@app.get("/status/{job_id}", response_model=JobStatus)
+async def job_status(job_id: str):
+    """Report the progress of an analysis started through /submit"""
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job id")
+    
+    return ORJSONResponse(job.model_dump())
+
+
+async def run_job(job_id: str, filename: str, code: str, cache_key: Tuple[bytes, str]):
+    """Run a submitted analysis and record its outcome for polling"""
+    try:
+        result = await run_analysis(filename, code, cache_key)
+        job = JobStatus(job_id=job_id, status="done", result=result)
+    except Exception as e:
+        logger.error(f"Analysis error for job {job_id}: {str(e)}")
+        job = JobStatus(job_id=job_id, status="failed", error=f"Analysis failed: {str(e)}")
+    
+    jobs.set(job_id, job)
+
+
+async def run_batch_job(job_id: str, filenames: List[str], contents: List):
+    """Run a submitted batch and record one entry per file for polling"""
+    async def analyze_one(filename: str, content) -> AnalysisResponse:
+        # Uploads that failed to read carry their error through
+        if isinstance(content, Exception):
+            raise content
+        return await analyze_content(filename, content)
+    
+    outcomes = await asyncio.gather(
+        *(analyze_one(filename, content) for filename, content in zip(filenames, contents)),
+        return_exceptions=True
+    )
+    
+    results = [batch_item(filename, outcome) for filename, outcome in zip(filenames, outcomes)]
+    jobs.set(job_id, JobStatus(job_id=job_id, status="done", results=results))
+
+
+def get_llm_semaphore() -> asyncio.Semaphore:
+    """Create the LLM semaphore on first use, inside the serving event loop"""
+    # Before Python 3.10, asyncio primitives bind to the loop current at
+    # creation, which at import time is not the one uvicorn runs
+    global _llm_semaphore
+    if _llm_semaphore is None:
+        _llm_semaphore = asyncio.Semaphore(LLM_CONCURRENCY)
+    return _llm_semaphore
+
+
+def batch_item(filename: str, outcome) -> BatchItemResult:
+    """Report one file's analysis or failure as a batch entry"""
+    if isinstance(outcome, HTTPException):
+        return BatchItemResult(filename=filename, error=outcome.detail)
+    elif isinstance(outcome, UnicodeDecodeError):
+        return BatchItemResult(
+            filename=filename,
+            error="File encoding error. Please upload a valid text file."
+        )
+    elif isinstance(outcome, Exception):
+        logger.error(f"Analysis error for {filename}: {str(outcome)}")
+        return BatchItemResult(filename=filename, error=f"Analysis failed: {str(outcome)}")
+    else:
+        return BatchItemResult(filename=filename, result=outcome)
+
+
+async def analyze_upload(file: UploadFile) -> AnalysisResponse:
+    """Analyze an upload, reusing the result for byte-identical submissions"""
+    content = await read_upload(file)
+    return await analyze_content(file.filename, content)
+
+
+async def analyze_content(filename: str, content: bytearray) -> AnalysisResponse:
+    """Analyze uploaded bytes, reusing the result for byte-identical submissions"""
+    cache_key = result_cache_key(filename, content)
+    cached = result_cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"Serving cached analysis for: {filename}")
+        return cached
+    
+    # bytearray decodes in place, without an intermediate bytes copy
+    code = content.decode('utf-8')
+    return await run_analysis(filename, code, cache_key)
+
+
+def result_cache_key(filename: str, content: bytes) -> Tuple[bytes, str]:
+    """Key a result by content hash and extension, which drives language detection"""
+    _, dot, extension = filename.rpartition('.')
+    digest = hashlib.blake2b(content, digest_size=16).digest()
+    return digest, extension.lower() if dot else ''
+
+
+def check_batch_size(files: List[UploadFile]):
+    """Reject batches that would buffer more than MAX_BATCH_FILES uploads"""
+    if len(files) > MAX_BATCH_FILES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many files. Maximum is {MAX_BATCH_FILES} per batch."
+        )
+
+
+async def read_upload(file: UploadFile) -> bytearray:
+    """Read an upload in bounded chunks"""
+    buffer = bytearray()
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        buffer += chunk
+        if len(buffer) > MAX_UPLOAD_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File too large. Maximum size is {MAX_UPLOAD_BYTES} bytes."
+            )
+    
+    return buffer
+
+
+async def run_analysis(filename: str, code: str, cache_key: Optional[Tuple[bytes, str]] = None) -> AnalysisResponse:
+    """Detect language, run static and AI analysis, and merge the results"""
+    logger.info(f"Analyzing file: {filename}")
+    
+    # Detect language
+    language = detect_language(filename, code)
+    logger.info(f"Detected language: {language}")
+    
+    # Static and AI-powered analysis are independent, so they run concurrently,
+    # within the LLM_CONCURRENCY cap shared by every endpoint
+    async with get_llm_semaphore():
+        loop = asyncio.get_running_loop()
+        static_task = loop.run_in_executor(cpu_pool, static_analyzer.analyze, code, language)
+        ai_task = ai_analyzer.analyze_code(
+            code=code,
+            language=language,
+            filename=filename
+        )
+        static_results, ai_results = await asyncio.gather(static_task, ai_task)
+    
+    # Merge results
+    errors = static_results.get("errors", []) + ai_results.get("errors", [])
+    recommendations = static_results.get("recommendations", []) + ai_results.get("recommendations", [])
+    
+    # Calculate final score
+    score = calculate_score(errors, ai_results.get("score", 75))
+    grade = get_grade(score)
+    
+    response = AnalysisResponse(
+        language=language,
+        errors=errors[:10],  # Limit to top 10 errors
+        recommendations=recommendations[:8],  # Limit to top 8 recommendations
+        score=score,
+        analysis_summary=ai_results.get("summary", "Code analysis completed."),
+        strengths=ai_results.get("strengths", [])[:5],
+        grade=grade
+    )
+    
+    # Stand-in results (a failed LLM call, or a reply that could not be
+    # parsed) are flagged "fallback" and not cached, so the LLM is retried
+    if cache_key is not None and not ai_results.get("fallback"):
+        result_cache.set(cache_key, response)
+    
+    logger.info(f"Analysis complete. Score: {score}/100")
+    return response
+
+
 def calculate_score(errors: List[Dict], base_score: int) -> int:
     """Calculate final score based on errors and AI score"""
     error_penalty = len(errors) * 3
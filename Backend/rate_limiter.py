@@ -0,0 +1,113 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, List, Mapping, Optional
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit for provider calls
+
+    The limit grows by one after every window of successful calls whose
+    average latency stays within target, and halves whenever the provider
+    throttles. A throttle also pauses new calls until its retry-after expires.
+    """
+
+    def __init__(self, initial: int = 8, maximum: int = 32, window: int = 50,
+                 target_latency: float = 10.0):
+        self.limit = initial
+        self.maximum = maximum
+        self.window = window
+        self.target_latency = target_latency
+        self._in_flight = 0
+        self._latencies: List[float] = []
+        self._paused_until = 0.0
+        # Created on first use: before Python 3.10 it would otherwise bind to
+        # the import-time event loop rather than the one serving requests
+        self._condition: Optional[asyncio.Condition] = None
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one unit of concurrency for the duration of a call"""
+        pause = self._paused_until - time.monotonic()
+        if pause > 0:
+            await asyncio.sleep(pause)
+
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        condition = self._condition
+
+        async with condition:
+            await condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            async with condition:
+                self._in_flight -= 1
+                condition.notify_all()
+
+    def record_success(self, latency: float, remaining: Optional[int] = None) -> None:
+        """Additive increase once a full window of calls met the latency target"""
+        if remaining is not None and remaining < self.limit:
+            # The provider is about to run out of request budget
+            self.limit = max(1, remaining)
+            self._latencies.clear()
+            return
+
+        self._latencies.append(latency)
+        if len(self._latencies) < self.window:
+            return
+
+        average = sum(self._latencies) / len(self._latencies)
+        self._latencies.clear()
+        if average <= self.target_latency and self.limit < self.maximum:
+            self.limit += 1
+
+    def record_throttle(self, retry_after: Optional[float] = None) -> None:
+        """Multiplicative decrease, pausing new calls for retry_after seconds"""
+        self.limit = max(1, self.limit // 2)
+        self._latencies.clear()
+        if retry_after:
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+
+def retry_after_seconds(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """Read the retry delay from retry-after-ms / retry-after response headers"""
+    if not headers:
+        return None
+
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def remaining_requests(headers: Optional[Mapping[str, str]]) -> Optional[int]:
+    """Read the remaining request budget advertised by OpenAI or Anthropic"""
+    if not headers:
+        return None
+
+    for name in ("x-ratelimit-remaining-requests", "anthropic-ratelimit-requests-remaining"):
+        value = headers.get(name)
+        if value is not None:
+            try:
+                return int(value)
+            except ValueError:
+                return None
+    return None
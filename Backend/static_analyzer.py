@@ -1,10 +1,48 @@
 import re
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 
 class StaticAnalyzer:
     """Static code analyzer for multiple languages"""
     
+    # Patterns are compiled once per process rather than looked up per line
+    _CALL_NO_SPACE = re.compile(r'\w+\(')
+    _CALL = re.compile(r'\w+\s*\(')
+    _ZERO_WITH_UNIT = re.compile(r':\s*0(px|em|rem|%)')
+    
+    # Line checks scan the whole buffer at once; each named group is one check.
+    # [^\S\n] keeps whitespace matches from running onto the next line.
+    _PYTHON_LINE_CHECKS = re.compile(
+        r'(?P<continuation>\\[^\S\n]*$)'
+        r'|(?P<bare_except>except[^\S\n]*:)'
+        r'|(?P<wildcard_import>import \*)',
+        re.MULTILINE
+    )
+    _LONG_LINE = re.compile(r'(?P<long_line>^[^\n]{121,})', re.MULTILINE)
+    _VAR_DECL = re.compile(r'(?P<var>\bvar[^\S\n]+\w+)')
+    # Zero-width so it never consumes text another check needs on the same line
+    _LOOSE_EQUALITY = re.compile(
+        r'(?P<loose_equality>^(?=[^\n]*==)(?![^\n]*===)(?=[^\n]*!=)(?![^\n]*!==))',
+        re.MULTILINE
+    )
+    # First non-blank character of every line that is not a // comment
+    _CODE_LINE = re.compile(r'^[^\S\n]*(?!//)\S', re.MULTILINE)
+    _CONSOLE_LOG = re.compile(r'(?P<console_log>console\.log)')
+    _LOWERCASE_CLASS = re.compile(r'(?P<lowercase_class>class[^\S\n]+[a-z])')
+    _SYSTEM_OUT = re.compile(r'(?P<system_out>System\.out\.println)')
+    _WIDGET_CLASS = re.compile(r'(?P<widget>StatelessWidget|StatefulWidget)')
+    
+    def __init__(self):
+        self._dispatch = {
+            "python": self._analyze_python,
+            "javascript": self._analyze_javascript,
+            "java": self._analyze_java,
+            "dart": self._analyze_dart,
+            "html": self._analyze_html,
+            "css": self._analyze_css,
+            "csharp": self._analyze_csharp
+        }
+    
     def analyze(self, code: str, language: str) -> Dict:
         """
         Perform static analysis on code
@@ -17,19 +55,43 @@ class StaticAnalyzer:
             Dictionary with errors and recommendations
         """
         
-        analyzer_method = getattr(self, f'_analyze_{language}', self._analyze_generic)
+        analyzer_method = self._dispatch.get(language, self._analyze_generic)
         return analyzer_method(code)
     
+    def _line_matches(self, code: str, *patterns: re.Pattern) -> List[Tuple[int, str]]:
+        """
+        Run line checks as one multiline scan per pattern
+        
+        Args:
+            code: Source code to scan
+            patterns: Compiled patterns whose named groups are the checks
+            
+        Returns:
+            Unique (line number, check name) pairs ordered by line, then by
+            the order the checks are declared in
+        """
+        hits = {}
+        
+        for rank, pattern in enumerate(patterns):
+            # Matches arrive in position order, so line numbers are advanced by
+            # counting newlines between consecutive matches in C, never per line
+            line, position = 1, 0
+            for match in pattern.finditer(code):
+                line += code.count('\n', position, match.start())
+                position = match.start()
+                check = match.lastgroup
+                hits.setdefault((line, check), (rank, pattern.groupindex[check]))
+        
+        return sorted(hits, key=lambda hit: (hit[0], hits[hit]))
+    
     def _analyze_python(self, code: str) -> Dict:
         """Analyze Python code"""
         errors = []
         recommendations = []
         
-        lines = code.split('\n')
-        
-        for i, line in enumerate(lines, 1):
+        for i, check in self._line_matches(code, self._PYTHON_LINE_CHECKS, self._LONG_LINE):
             # Check for syntax issues
-            if line.strip().endswith('\\'):
+            if check == "continuation":
                 errors.append({
                     "type": "syntax",
                     "message": "Unnecessary line continuation",
@@ -37,14 +99,14 @@ class StaticAnalyzer:
                 })
             
             # Check for common issues
-            if re.search(r'except\s*:', line):
+            elif check == "bare_except":
                 errors.append({
                     "type": "best_practice",
                     "message": "Bare except clause - specify exception type",
                     "line": str(i)
                 })
             
-            if 'import *' in line:
+            elif check == "wildcard_import":
                 errors.append({
                     "type": "style",
                     "message": "Avoid wildcard imports",
@@ -52,7 +114,7 @@ class StaticAnalyzer:
                 })
             
             # Check line length
-            if len(line) > 120:
+            elif check == "long_line":
                 recommendations.append(f"Line {i} exceeds 120 characters")
         
         # Check for missing docstrings
@@ -60,7 +122,7 @@ class StaticAnalyzer:
             recommendations.append("Add docstrings to functions")
         
         # Check for proper spacing
-        if re.search(r'\w+\(', code) and not re.search(r'\w+\s*\(', code):
+        if self._CALL_NO_SPACE.search(code) and not self._CALL.search(code):
             recommendations.append("Add spaces around operators for readability")
         
         return {
@@ -73,11 +135,10 @@ class StaticAnalyzer:
         errors = []
         recommendations = []
         
-        lines = code.split('\n')
-        
-        for i, line in enumerate(lines, 1):
+        line_checks = self._line_matches(code, self._VAR_DECL, self._LOOSE_EQUALITY, self._CONSOLE_LOG)
+        for i, check in line_checks:
             # Check for var usage
-            if re.search(r'\bvar\s+\w+', line):
+            if check == "var":
                 errors.append({
                     "type": "style",
                     "message": "Use 'const' or 'let' instead of 'var'",
@@ -85,7 +146,7 @@ class StaticAnalyzer:
                 })
             
             # Check for == instead of ===
-            if '==' in line and '===' not in line and '!=' in line and '!==' not in line:
+            elif check == "loose_equality":
                 errors.append({
                     "type": "best_practice",
                     "message": "Use strict equality (===) instead of ==",
@@ -93,11 +154,12 @@ class StaticAnalyzer:
                 })
             
             # Check for console.log (should be removed in production)
-            if 'console.log' in line:
+            elif check == "console_log":
                 recommendations.append(f"Line {i}: Remove console.log in production code")
         
         # Check for missing semicolons (basic check)
-        if code.count(';') < len([l for l in lines if l.strip() and not l.strip().startswith('//')]): recommendations.append("Consider using semicolons consistently")
+        if code.count(';') < len(self._CODE_LINE.findall(code)):
+            recommendations.append("Consider using semicolons consistently")
         
         # Check for function declarations
         if 'function' in code:
@@ -113,11 +175,9 @@ class StaticAnalyzer:
         errors = []
         recommendations = []
         
-        lines = code.split('\n')
-        
-        for i, line in enumerate(lines, 1):
+        for i, check in self._line_matches(code, self._LOWERCASE_CLASS, self._SYSTEM_OUT):
             # Check for proper class naming
-            if re.search(r'class\s+[a-z]', line):
+            if check == "lowercase_class":
                 errors.append({
                     "type": "naming",
                     "message": "Class names should start with uppercase",
@@ -125,7 +185,7 @@ class StaticAnalyzer:
                 })
             
             # Check for System.out.println
-            if 'System.out.println' in line:
+            elif check == "system_out":
                 recommendations.append(f"Line {i}: Use logging framework instead of System.out")
         
         # Check for main method
@@ -146,12 +206,9 @@ class StaticAnalyzer:
         errors = []
         recommendations = []
         
-        lines = code.split('\n')
-        
-        for i, line in enumerate(lines, 1):
-            # Check for proper widget structure
-            if 'StatelessWidget' in line or 'StatefulWidget' in line:
-                recommendations.append("Ensure widget follows Flutter best practices")
+        # Check for proper widget structure
+        for _ in self._line_matches(code, self._WIDGET_CLASS):
+            recommendations.append("Ensure widget follows Flutter best practices")
         
         # Check for build method
         if 'Widget build' in code:
@@ -230,7 +287,7 @@ class StaticAnalyzer:
             recommendations.append("Consider using autoprefixer instead of manual vendor prefixes")
         
         # Check for units on zero values
-        if re.search(r':\s*0(px|em|rem|%)', code):
+        if self._ZERO_WITH_UNIT.search(code):
             recommendations.append("Remove units from zero values")
         
         return {
@@ -243,16 +300,13 @@ class StaticAnalyzer:
         errors = []
         recommendations = []
         
-        lines = code.split('\n')
-        
-        for i, line in enumerate(lines, 1):
-            # Check for proper naming
-            if re.search(r'class\s+[a-z]', line):
-                errors.append({
-                    "type": "naming",
-                    "message": "Class names should use PascalCase",
-                    "line": str(i)
-                })
+        # Check for proper naming
+        for i, _ in self._line_matches(code, self._LOWERCASE_CLASS):
+            errors.append({
+                "type": "naming",
+                "message": "Class names should use PascalCase",
+                "line": str(i)
+            })
         
         # Check for using statements
         if 'using System' not in code:
@@ -1,16 +1,12 @@
 import streamlit as st
-import requests
-import json
-from typing import Optional
+import hashlib
+import copy
+import orjson
+import time
+from collections import OrderedDict
 from datetime import datetime
 from io import BytesIO
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, Image
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
-from reportlab.pdfgen import canvas
+from typing import Optional
 
 # Page configuration
 st.set_page_config(
@@ -21,7 +17,7 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
+_CSS = """
 <style>
     .main-header {
         font-size: 3rem;
@@ -79,33 +75,90 @@ st.markdown("""
         margin: 0.5rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
 
 # API Configuration
 API_URL = "http://localhost:8000"
 
+# Analyses kept per session, so switching back to a recent file is instant
+MAX_RECENT_RESULTS = 8
+
+# Files sent in one /submit-batch job; a whole batch fits in the recent results
+MAX_BATCH_FILES = MAX_RECENT_RESULTS
+
+# Longer files are previewed in part; the whole file is still analyzed
+PREVIEW_MAX_LINES = 500
+
+# Submitted analyses are polled with exponential backoff, in seconds
+JOB_POLL_INITIAL = 0.25
+JOB_POLL_MAX = 2.0
+JOB_TIMEOUT = 300
+
+# Syntax highlighting for the code preview, keyed by file extension
+_EXT_LANG = {
+    'py': 'python', 'js': 'javascript', 'jsx': 'javascript',
+    'ts': 'typescript', 'tsx': 'typescript', 'java': 'java',
+    'dart': 'dart', 'cs': 'csharp', 'rb': 'ruby', 'go': 'go',
+    'rs': 'rust', 'kt': 'kotlin', 'swift': 'swift', 'php': 'php',
+    'html': 'html', 'css': 'css'
+}
+
+# Languages listed in the sidebar
+_LANGUAGES = (
+    "Python", "JavaScript", "TypeScript",
+    "Java", "Dart/Flutter", "C#",
+    "HTML", "CSS", "PHP", "Ruby",
+    "Go", "Rust", "Swift", "Kotlin"
+)
+_LANGUAGES_MD = "\n".join(f"- {lang}" for lang in _LANGUAGES)
+
+# Result card templates, filled with str.format_map per item
+_ERROR_CARD = (
+    '<div class="error-card"><strong>Line {line}:</strong> {message}'
+    '<br><small>Type: {type}</small></div>'
+)
+_ERROR_DEFAULTS = {"line": "N/A", "message": "Unknown error", "type": "general"}
+_STRENGTH_CARD = '<div class="strength-card">✓ {}</div>'
+_RECOMMENDATION_CARD = '<div class="recommendation-card">{}. {}</div>'
+
 
+@st.cache_resource
+def inject_css():
+    """Emit the custom CSS; on later reruns Streamlit replays the cached element"""
+    st.markdown(_CSS, unsafe_allow_html=True)
+
+
+@st.cache_resource
+def get_session():
+    """Pooled session for all backend calls, kept across reruns"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=0))
+    session.headers.update({"Connection": "keep-alive", "Accept-Encoding": "gzip"})
+    return session
+
+
+@st.cache_data(ttl=5, show_spinner=False)
 def check_api_health() -> bool:
-    """Check if backend API is available"""
+    """Check if backend API is available (memoized briefly across reruns)"""
     try:
-        response = requests.get(f"{API_URL}/health", timeout=2)
+        response = get_session().get(f"{API_URL}/health", timeout=2)
         return response.status_code == 200
     except:
         return False
 
 
-def analyze_code(file) -> Optional[dict]:
-    """Send code to backend for analysis"""
+def call_api(method: str, path: str, **kwargs) -> Optional[dict]:
+    """Call the backend and parse its JSON reply, reporting failures in the UI"""
+    import requests
+    
     try:
-        files = {"file": (file.name, file.getvalue(), file.type)}
-        response = requests.post(
-            f"{API_URL}/analyze-code",
-            files=files,
-            timeout=30
-        )
+        response = get_session().request(method, f"{API_URL}{path}", **kwargs)
         
         if response.status_code == 200:
-            return response.json()
+            return orjson.loads(response.content)
         else:
             st.error(f"Analysis failed: {response.text}")
             return None
@@ -120,79 +173,297 @@ def analyze_code(file) -> Optional[dict]:
         return None
 
 
-def generate_pdf_report(result: dict, filename: str, code_preview: str = "") -> BytesIO:
-    """Generate a beautiful PDF report"""
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
+def submit_analysis(file) -> Optional[dict]:
+    """Submit code for background analysis; cached results come back already done"""
+    # Pass the file object itself so requests reads from it rather than
+    # from a getvalue() copy of the whole upload
+    file.seek(0)
+    return call_api(
+        "POST", "/submit",
+        files={"file": (file.name, file, file.type)},
+        timeout=30
+    )
+
+
+def wait_for_job(job: dict) -> Optional[dict]:
+    """Poll a submitted job until it finishes"""
+    # Updating the caption each poll lets Streamlit stop this run when the
+    # user interacts; the job stays in session state and polling resumes
+    progress = st.empty()
+    delay = JOB_POLL_INITIAL
+    started = time.monotonic()
     
-    # Container for the 'Flowable' objects
-    elements = []
+    while job["status"] == "pending":
+        elapsed = time.monotonic() - started
+        if elapsed > JOB_TIMEOUT:
+            st.error("Request timed out. Please try again.")
+            return None
+        
+        progress.caption(f"⏳ Waiting for results... {elapsed:.0f}s")
+        time.sleep(delay)
+        delay = min(delay * 2, JOB_POLL_MAX)
+        
+        job = call_api("GET", f"/status/{job['job_id']}", timeout=5)
+        if job is None:
+            return None
+    
+    progress.empty()
+    if job["status"] == "failed":
+        st.error(job["error"])
+        return None
+    
+    return job
+
+
+def submit_batch(files: list) -> Optional[dict]:
+    """Submit several files as one background job"""
+    multipart = []
+    for file in files:
+        file.seek(0)
+        multipart.append(("files", (file.name, file, file.type)))
+    
+    return call_api("POST", "/submit-batch", files=multipart, timeout=30)
+
+
+def remember_job(job: dict, files: list):
+    """Keep each file's result from a finished job, reporting per-file failures"""
+    # Batch jobs list one entry per file, in upload order
+    if job["results"] is None:
+        items = [{"result": job["result"], "error": None}]
+    else:
+        items = job["results"]
+    
+    for file, item in zip(files, items):
+        if item["error"]:
+            st.error(f"{file['filename']}: {item['error']}")
+            continue
+        
+        remember_result(file["key"], normalize_result(item["result"]), file["filename"], file["code_content"])
+
+
+def normalize_result(result: dict) -> dict:
+    """Fill missing error fields once, so rendering can read them directly"""
+    result['errors'] = [{**_ERROR_DEFAULTS, **error} for error in result['errors']]
+    return result
+
+
+def remember_result(key: tuple, result: dict, filename: str, code_content: str):
+    """Make a result the current one and keep it in the session's recent results"""
+    recent = st.session_state.setdefault('recent_results', OrderedDict())
+    recent[key] = result
+    recent.move_to_end(key)
+    while len(recent) > MAX_RECENT_RESULTS:
+        recent.popitem(last=False)
+    
+    st.session_state['analysis_result'] = result
+    st.session_state['filename'] = filename
+    st.session_state['code_content'] = code_content
+
+
+def load_uploads(uploaded_files: list) -> dict:
+    """Decoded text and content digest of each upload by file_id, computed once per file"""
+    loaded = st.session_state.get('uploads', {})
+    uploads = {}
+    for file in uploaded_files:
+        upload = loaded.get(file.file_id)
+        if upload is None:
+            raw = file.getvalue()
+            upload = {
+                'code': raw.decode('utf-8', errors='replace'),
+                'digest': hashlib.blake2b(raw, digest_size=16).digest()
+            }
+        uploads[file.file_id] = upload
+    
+    # Only the current uploads are kept
+    st.session_state['uploads'] = uploads
+    return uploads
+
+
+@st.cache_resource
+def _configure_reportlab():
+    """Apply the process-wide ReportLab settings used for PDF reports"""
+    from reportlab import rl_config
+    
+    # Compressed streams are written as raw binary; ASCII85 text encoding
+    # only adds a quarter to their size and an extra encoding pass
+    rl_config.useA85 = 0
+
+
+@st.cache_resource
+def pdf_styles() -> dict:
+    """Paragraph and table styles for PDF reports, built once per process"""
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import TableStyle
+    
+    def list_table_style(header_color, header_text_color, header_size: int, body_size: int, stripe_color):
+        """Style shared by the numbered strengths, errors and recommendations tables"""
+        return TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), header_color),
+            ('TEXTCOLOR', (0, 0), (-1, 0), header_text_color),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), header_size),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), body_size),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, stripe_color]),
+        ])
+    
+    def score_table_style(grade_color):
+        """Style for the score box, with the score shown in the grade's color"""
+        return TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1E88E5')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 14),
+            ('FONTNAME', (0, 1), (-1, 1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 1), (-1, 1), 36),
+            ('TEXTCOLOR', (0, 1), (-1, 1), grade_color),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 20),
+            ('TOPPADDING', (0, 0), (-1, -1), 20),
+            ('GRID', (0, 0), (-1, -1), 2, colors.HexColor('#1E88E5')),
+            ('BOX', (0, 0), (-1, -1), 2, colors.HexColor('#1E88E5')),
+        ])
     
-    # Define styles
     styles = getSampleStyleSheet()
     
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=28,
-        textColor=colors.HexColor('#1E88E5'),
-        spaceAfter=30,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
+    # Determine color based on grade
+    grade_colors = {
+        'A': colors.HexColor('#4CAF50'),
+        'B': colors.HexColor('#2196F3'),
+        'C': colors.HexColor('#FF9800'),
+        'D': colors.HexColor('#FF5722'),
+        'F': colors.HexColor('#F44336')
+    }
     
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=16,
-        textColor=colors.HexColor('#333333'),
-        spaceAfter=12,
-        spaceBefore=12,
-        fontName='Helvetica-Bold'
-    )
+    return {
+        'title': ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=28,
+            textColor=colors.HexColor('#1E88E5'),
+            spaceAfter=30,
+            alignment=TA_CENTER,
+            fontName='Helvetica-Bold'
+        ),
+        'subtitle': styles['Heading2'],
+        'heading': ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=16,
+            textColor=colors.HexColor('#333333'),
+            spaceAfter=12,
+            spaceBefore=12,
+            fontName='Helvetica-Bold'
+        ),
+        'body': ParagraphStyle(
+            'CustomBody',
+            parent=styles['BodyText'],
+            fontSize=10,
+            textColor=colors.HexColor('#444444'),
+            spaceAfter=10,
+            alignment=TA_JUSTIFY
+        ),
+        'footer': ParagraphStyle(
+            'Footer',
+            parent=styles['Normal'],
+            fontSize=8,
+            textColor=colors.grey,
+            alignment=TA_CENTER
+        ),
+        'info_table': TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f0f0f0')),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#333333')),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ]),
+        'score_tables': {grade: score_table_style(color) for grade, color in grade_colors.items()},
+        'score_table_default': score_table_style(colors.grey),
+        'strengths_table': list_table_style(
+            colors.HexColor('#28a745'), colors.whitesmoke, 11, 9, colors.HexColor('#f0f9f0')
+        ),
+        'errors_table': list_table_style(
+            colors.HexColor('#ffc107'), colors.HexColor('#333333'), 10, 8, colors.HexColor('#fff9e6')
+        ),
+        'recommendations_table': list_table_style(
+            colors.HexColor('#17a2b8'), colors.whitesmoke, 11, 9, colors.HexColor('#e9f7f9')
+        ),
+    }
+
+
+@st.cache_resource
+def pdf_static_paragraphs() -> dict:
+    """Report paragraphs whose text never changes, parsed once per process"""
+    from reportlab.platypus import Paragraph
     
-    subheading_style = ParagraphStyle(
-        'CustomSubHeading',
-        parent=styles['Heading3'],
-        fontSize=12,
-        textColor=colors.HexColor('#666666'),
-        spaceAfter=10,
-        fontName='Helvetica-Bold'
-    )
+    styles = pdf_styles()
+    heading_style = styles['heading']
+    
+    # Labels are plain text: the standard PDF fonts have no emoji glyphs
+    return {
+        'title': Paragraph("AI Code Tutor Platform", styles['title']),
+        'subtitle': Paragraph("Code Analysis Report", styles['subtitle']),
+        'summary_heading': Paragraph("Analysis Summary", heading_style),
+        'strengths_heading': Paragraph("Code Strengths", heading_style),
+        'errors_heading': Paragraph("Errors & Issues", heading_style),
+        'no_errors': Paragraph("No errors detected! Great job!", styles['body']),
+        'recommendations_heading': Paragraph("Recommendations", heading_style),
+        'footer': Paragraph(
+            "Generated by AI Code Tutor Platform | Helping developers write better code",
+            styles['footer']
+        ),
+    }
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def generate_pdf_report(result: dict, filename: str, report_time: datetime) -> bytes:
+    """Generate a beautiful PDF report"""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer
+    
+    _configure_reportlab()
+    styles = pdf_styles()
+    # Layout state is set on each copy; the parsed text is shared read-only
+    static = {name: copy.copy(paragraph) for name, paragraph in pdf_static_paragraphs().items()}
     
-    body_style = ParagraphStyle(
-        'CustomBody',
-        parent=styles['BodyText'],
-        fontSize=10,
-        textColor=colors.HexColor('#444444'),
-        spaceAfter=10,
-        alignment=TA_JUSTIFY
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=letter,
+        topMargin=0.5*inch,
+        bottomMargin=0.5*inch,
+        pageCompression=1
     )
     
+    # Container for the 'Flowable' objects
+    elements = []
+    
+    body_style = styles['body']
+    
     # Title
-    elements.append(Paragraph("🎓 AI Code Tutor Platform", title_style))
-    elements.append(Paragraph("Code Analysis Report", styles['Heading2']))
+    elements.append(static['title'])
+    elements.append(static['subtitle'])
     elements.append(Spacer(1, 0.3*inch))
     
     # Report Info
     report_info = [
-        ['Report Date:', datetime.now().strftime('%B %d, %Y at %I:%M %p')],
+        ['Report Date:', report_time.strftime('%B %d, %Y at %I:%M %p')],
         ['File Name:', filename],
         ['Language:', result['language'].title()],
     ]
     
     info_table = Table(report_info, colWidths=[2*inch, 4*inch])
-    info_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f0f0f0')),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#333333')),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-    ]))
+    info_table.setStyle(styles['info_table'])
     elements.append(info_table)
     elements.append(Spacer(1, 0.3*inch))
     
@@ -200,147 +471,167 @@ def generate_pdf_report(result: dict, filename: str, code_preview: str = "") ->
     score = result['score']
     grade = result['grade']
     
-    # Determine color based on grade
-    grade_colors = {
-        'A': colors.HexColor('#4CAF50'),
-        'B': colors.HexColor('#2196F3'),
-        'C': colors.HexColor('#FF9800'),
-        'D': colors.HexColor('#FF5722'),
-        'F': colors.HexColor('#F44336')
-    }
-    grade_color = grade_colors.get(grade, colors.grey)
-    
     score_data = [
         ['SCORE', 'GRADE'],
         [f'{score}/100', grade]
     ]
     
+    # The score is colored by grade
     score_table = Table(score_data, colWidths=[3*inch, 3*inch])
-    score_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1E88E5')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 14),
-        ('FONTNAME', (0, 1), (-1, 1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 1), (-1, 1), 36),
-        ('TEXTCOLOR', (0, 1), (-1, 1), grade_color),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 20),
-        ('TOPPADDING', (0, 0), (-1, -1), 20),
-        ('GRID', (0, 0), (-1, -1), 2, colors.HexColor('#1E88E5')),
-        ('BOX', (0, 0), (-1, -1), 2, colors.HexColor('#1E88E5')),
-    ]))
+    score_table.setStyle(styles['score_tables'].get(grade, styles['score_table_default']))
     elements.append(score_table)
     elements.append(Spacer(1, 0.3*inch))
     
     # Summary Section
-    elements.append(Paragraph("📝 Analysis Summary", heading_style))
+    elements.append(static['summary_heading'])
     summary_text = result.get('analysis_summary', 'No summary available')
     elements.append(Paragraph(summary_text, body_style))
     elements.append(Spacer(1, 0.2*inch))
     
     # Strengths Section
     if result.get('strengths'):
-        elements.append(Paragraph("💪 Code Strengths", heading_style))
+        elements.append(static['strengths_heading'])
         
         strengths_data = [['#', 'Strength']]
         for i, strength in enumerate(result['strengths'], 1):
             strengths_data.append([str(i), strength])
         
         strengths_table = Table(strengths_data, colWidths=[0.5*inch, 5.5*inch])
-        strengths_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#28a745')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f9f0')]),
-        ]))
+        strengths_table.setStyle(styles['strengths_table'])
         elements.append(strengths_table)
         elements.append(Spacer(1, 0.2*inch))
     
     # Errors Section
     if result.get('errors'):
-        elements.append(Paragraph("⚠️ Errors & Issues", heading_style))
+        elements.append(static['errors_heading'])
         
         errors_data = [['Line', 'Type', 'Message']]
         for error in result['errors']:
-            errors_data.append([
-                error.get('line', 'N/A'),
-                error.get('type', 'general'),
-                error.get('message', 'Unknown error')
-            ])
+            errors_data.append([error['line'], error['type'], error['message']])
         
         errors_table = Table(errors_data, colWidths=[0.7*inch, 1.3*inch, 4*inch])
-        errors_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#ffc107')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#333333')),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#fff9e6')]),
-        ]))
+        errors_table.setStyle(styles['errors_table'])
         elements.append(errors_table)
         elements.append(Spacer(1, 0.2*inch))
     else:
-        elements.append(Paragraph("⚠️ Errors & Issues", heading_style))
-        elements.append(Paragraph("✅ No errors detected! Great job!", body_style))
+        elements.append(static['errors_heading'])
+        elements.append(static['no_errors'])
         elements.append(Spacer(1, 0.2*inch))
     
     # Recommendations Section
     if result.get('recommendations'):
-        elements.append(Paragraph("💡 Recommendations", heading_style))
+        elements.append(static['recommendations_heading'])
         
         rec_data = [['#', 'Recommendation']]
         for i, rec in enumerate(result['recommendations'], 1):
             rec_data.append([str(i), rec])
         
         rec_table = Table(rec_data, colWidths=[0.5*inch, 5.5*inch])
-        rec_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#17a2b8')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#e9f7f9')]),
-        ]))
+        rec_table.setStyle(styles['recommendations_table'])
         elements.append(rec_table)
         elements.append(Spacer(1, 0.2*inch))
     
     # Footer
     elements.append(Spacer(1, 0.4*inch))
-    footer_style = ParagraphStyle(
-        'Footer',
-        parent=styles['Normal'],
-        fontSize=8,
-        textColor=colors.grey,
-        alignment=TA_CENTER
-    )
-    elements.append(Paragraph("Generated by AI Code Tutor Platform | Helping developers write better code", footer_style))
-    elements.append(Paragraph(f"Report ID: {datetime.now().strftime('%Y%m%d%H%M%S')}", footer_style))
+    footer_style = styles['footer']
+    elements.append(static['footer'])
+    elements.append(Paragraph(f"Report ID: {report_time.strftime('%Y%m%d%H%M%S')}", footer_style))
     
     # Build PDF
     doc.build(elements)
-    buffer.seek(0)
-    return buffer
+    return buffer.getvalue()
+
+
+def render_results(result: dict):
+    """Render a finished analysis in the results column"""
+    # Score display
+    score = result['score']
+    grade = result['grade']
+    grade_class = f"grade-{grade.lower()}"
+    
+    # Cards are plain HTML, so st.html renders them without a Markdown parse;
+    # score, language and summary go out as a single element
+    st.html(
+        f'<div class="score-display {grade_class}">'
+        f'{score}/100<br><span style="font-size: 2rem;">Grade: {grade}</span>'
+        f'</div>'
+        # Language detection
+        f'<div class="metric-card">'
+        f'<strong>🔤 Detected Language:</strong> {result["language"].title()}'
+        f'</div>'
+        # Summary
+        f'<div class="metric-card">'
+        f'<strong>📝 Summary:</strong><br>{result["analysis_summary"]}'
+        f'</div>'
+    )
+    
+    # Errors
+    if result['errors']:
+        st.subheader("⚠️ Errors Found")
+        # Each list is emitted as one element rather than one per item
+        st.html("".join(_ERROR_CARD.format_map(error) for error in result['errors']))
+    else:
+        st.success("✅ No errors detected!")
+    
+    # Strengths
+    if result.get('strengths'):
+        st.subheader("💪 Strengths")
+        st.html("".join(_STRENGTH_CARD.format(strength) for strength in result['strengths']))
+    
+    # Recommendations
+    if result['recommendations']:
+        st.subheader("💡 Recommendations")
+        st.html("".join(
+            _RECOMMENDATION_CARD.format(i, rec)
+            for i, rec in enumerate(result['recommendations'], 1)
+        ))
+    
+    # Download report button - NOW GENERATES PDF
+    st.divider()
+    col_a, col_b = st.columns(2)
+    
+    with col_a:
+        if st.button("📥 Download PDF Report", use_container_width=True, type="primary"):
+            # Reports are memoized on their arguments; a minute-resolution time
+            # lets repeat clicks reuse a build without serving a stale date
+            report_time = datetime.now().replace(second=0, microsecond=0)
+            with st.spinner("📄 Generating beautiful PDF report..."):
+                pdf_bytes = generate_pdf_report(
+                    result, 
+                    st.session_state.get('filename', 'code_file'),
+                    report_time
+                )
+                
+                st.download_button(
+                    label="💾 Save PDF Report",
+                    data=pdf_bytes,
+                    file_name=f"code_analysis_report_{report_time.strftime('%Y%m%d_%H%M')}.pdf",
+                    mime="application/pdf",
+                    use_container_width=True
+                )
+                st.success("✅ PDF Report generated successfully!")
+    
+    with col_b:
+        # Also offer JSON for developers who want raw data
+        # orjson returns bytes, which download_button accepts as-is
+        json_report = orjson.dumps({
+            "analysis_report": result,
+            "filename": st.session_state.get('filename', 'code_file'),
+            "timestamp": datetime.now().isoformat()
+        }, option=orjson.OPT_INDENT_2)
+        
+        st.download_button(
+            label="📋 Download JSON (Dev)",
+            data=json_report,
+            file_name=f"code_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+            mime="application/json",
+            use_container_width=True
+        )
 
 
 def main():
+    inject_css()
+    
     # Header
     st.markdown('<div class="main-header">🎓 AI Code Tutor Platform</div>', unsafe_allow_html=True)
     st.markdown('<div class="sub-header">Upload your code and get instant AI-powered feedback</div>', unsafe_allow_html=True)
@@ -357,14 +648,7 @@ def main():
         """)
         
         st.header("🔧 Supported Languages")
-        languages = [
-            "Python", "JavaScript", "TypeScript",
-            "Java", "Dart/Flutter", "C#",
-            "HTML", "CSS", "PHP", "Ruby",
-            "Go", "Rust", "Swift", "Kotlin"
-        ]
-        for lang in languages:
-            st.write(f"• {lang}")
+        st.markdown(_LANGUAGES_MD)
         
         st.divider()
         
@@ -375,150 +659,105 @@ def main():
         else:
             st.error("❌ API Disconnected")
             st.info("Please start the backend server:\n```bash\ncd backend\npython main.py\n```")
+        
+        st.button("🔄 Refresh Status", on_click=check_api_health.clear, use_container_width=True)
     
-    # Main content
-    tab1, tab2 = st.tabs(["📤 Upload & Analyze", "📖 How It Works"])
+    # Main content; unlike st.tabs, only the selected view's body runs
+    view = st.radio(
+        "View",
+        ["📤 Upload & Analyze", "📖 How It Works"],
+        horizontal=True,
+        key="view",
+        label_visibility="collapsed"
+    )
     
-    with tab1:
+    if view == "📤 Upload & Analyze":
         col1, col2 = st.columns([1, 1])
         
         with col1:
             st.subheader("📁 Upload Your Code")
             
-            uploaded_file = st.file_uploader(
-                "Choose a code file",
+            uploaded_files = st.file_uploader(
+                "Choose code files",
                 type=['py', 'js', 'jsx', 'ts', 'tsx', 'java', 'dart', 'html', 'css', 'cs', 'php', 'rb', 'go', 'rs', 'swift', 'kt'],
-                help="Upload any supported code file for analysis"
+                accept_multiple_files=True,
+                help="Upload one or more supported code files for analysis"
             )
             
-            if uploaded_file:
-                st.success(f"✅ File loaded: {uploaded_file.name}")
+            result_key = None
+            if uploaded_files:
+                if len(uploaded_files) > MAX_BATCH_FILES:
+                    st.warning(f"Only the first {MAX_BATCH_FILES} files are used")
+                    uploaded_files = uploaded_files[:MAX_BATCH_FILES]
+                
+                if len(uploaded_files) > 1:
+                    st.success(f"✅ {len(uploaded_files)} files loaded")
+                    uploaded_file = st.selectbox("Show file", uploaded_files, format_func=lambda file: file.name)
+                else:
+                    uploaded_file = uploaded_files[0]
+                    st.success(f"✅ File loaded: {uploaded_file.name}")
                 
                 # Display code preview
                 st.subheader("👀 Code Preview")
-                code_content = uploaded_file.getvalue().decode('utf-8')
-                st.code(code_content, language='python', line_numbers=True)
+                uploads = load_uploads(uploaded_files)
+                upload = uploads[uploaded_file.file_id]
+                code_content = upload['code']
+                preview_language = _EXT_LANG.get(uploaded_file.name.rsplit('.', 1)[-1].lower())
+                # Every rerun resends the preview, so its size is bounded
+                preview_lines = code_content.split('\n', PREVIEW_MAX_LINES)
+                st.code('\n'.join(preview_lines[:PREVIEW_MAX_LINES]), language=preview_language, line_numbers=True)
+                if len(preview_lines) > PREVIEW_MAX_LINES:
+                    total_lines = code_content.count('\n') + 1
+                    st.caption(f"Showing the first {PREVIEW_MAX_LINES} of {total_lines} lines")
+                
+                result_key = (uploaded_file.name, upload['digest'])
                 
                 # Analyze button
                 if st.button("🚀 Analyze Code", type="primary", use_container_width=True):
-                    with st.spinner("🔄 Analyzing your code..."):
-                        # Reset file pointer
-                        uploaded_file.seek(0)
-                        result = analyze_code(uploaded_file)
-                        
-                        if result:
-                            st.session_state['analysis_result'] = result
-                            st.session_state['filename'] = uploaded_file.name
-                            st.session_state['code_content'] = code_content
-                            st.rerun()
+                    # Several files go to the backend as a single batch job
+                    if len(uploaded_files) > 1:
+                        job = submit_batch(uploaded_files)
+                    else:
+                        job = submit_analysis(uploaded_file)
+                    
+                    if job:
+                        st.session_state['pending_job'] = {
+                            "job": job,
+                            "files": [
+                                {
+                                    "key": (file.name, uploads[file.file_id]['digest']),
+                                    "filename": file.name,
+                                    "code_content": uploads[file.file_id]['code']
+                                }
+                                for file in uploaded_files
+                            ]
+                        }
+            
+            # A pending job survives reruns, so interacting with the page while
+            # it runs only restarts the polling
+            pending = st.session_state.get('pending_job')
+            if pending:
+                with st.spinner("🔄 Analyzing your code..."):
+                    job = wait_for_job(pending["job"])
+                del st.session_state['pending_job']
+                
+                if job:
+                    remember_job(job, pending["files"])
+            
+            # A file analyzed earlier in this session is shown without a backend call
+            recent = st.session_state.get('recent_results', {})
+            if result_key in recent:
+                remember_result(result_key, recent[result_key], uploaded_file.name, code_content)
         
         with col2:
             st.subheader("📊 Analysis Results")
             
             if 'analysis_result' in st.session_state:
-                result = st.session_state['analysis_result']
-                
-                # Score display
-                score = result['score']
-                grade = result['grade']
-                grade_class = f"grade-{grade.lower()}"
-                
-                st.markdown(
-                    f'<div class="score-display {grade_class}">'
-                    f'{score}/100<br><span style="font-size: 2rem;">Grade: {grade}</span>'
-                    f'</div>',
-                    unsafe_allow_html=True
-                )
-                
-                # Language detection
-                st.markdown(
-                    f'<div class="metric-card">'
-                    f'<strong>🔤 Detected Language:</strong> {result["language"].title()}'
-                    f'</div>',
-                    unsafe_allow_html=True
-                )
-                
-                # Summary
-                st.markdown(
-                    f'<div class="metric-card">'
-                    f'<strong>📝 Summary:</strong><br>{result["analysis_summary"]}'
-                    f'</div>',
-                    unsafe_allow_html=True
-                )
-                
-                # Errors
-                if result['errors']:
-                    st.subheader("⚠️ Errors Found")
-                    for error in result['errors']:
-                        st.markdown(
-                            f'<div class="error-card">'
-                            f'<strong>Line {error.get("line", "N/A")}:</strong> {error.get("message", "Unknown error")}'
-                            f'<br><small>Type: {error.get("type", "general")}</small>'
-                            f'</div>',
-                            unsafe_allow_html=True
-                        )
-                else:
-                    st.success("✅ No errors detected!")
-                
-                # Strengths
-                if result.get('strengths'):
-                    st.subheader("💪 Strengths")
-                    for strength in result['strengths']:
-                        st.markdown(
-                            f'<div class="strength-card">✓ {strength}</div>',
-                            unsafe_allow_html=True
-                        )
-                
-                # Recommendations
-                if result['recommendations']:
-                    st.subheader("💡 Recommendations")
-                    for i, rec in enumerate(result['recommendations'], 1):
-                        st.markdown(
-                            f'<div class="recommendation-card">{i}. {rec}</div>',
-                            unsafe_allow_html=True
-                        )
-                
-                # Download report button - NOW GENERATES PDF
-                st.divider()
-                col_a, col_b = st.columns(2)
-                
-                with col_a:
-                    if st.button("📥 Download PDF Report", use_container_width=True, type="primary"):
-                        with st.spinner("📄 Generating beautiful PDF report..."):
-                            pdf_buffer = generate_pdf_report(
-                                result, 
-                                st.session_state.get('filename', 'code_file'),
-                                st.session_state.get('code_content', '')
-                            )
-                            
-                            st.download_button(
-                                label="💾 Save PDF Report",
-                                data=pdf_buffer,
-                                file_name=f"code_analysis_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
-                                mime="application/pdf",
-                                use_container_width=True
-                            )
-                            st.success("✅ PDF Report generated successfully!")
-                
-                with col_b:
-                    # Also offer JSON for developers who want raw data
-                    json_report = json.dumps({
-                        "analysis_report": result,
-                        "filename": st.session_state.get('filename', 'code_file'),
-                        "timestamp": datetime.now().isoformat()
-                    }, indent=2)
-                    
-                    st.download_button(
-                        label="📋 Download JSON (Dev)",
-                        data=json_report,
-                        file_name=f"code_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                        mime="application/json",
-                        use_container_width=True
-                    )
+                render_results(st.session_state['analysis_result'])
             else:
                 st.info("👆 Upload a file and click 'Analyze Code' to see results")
     
-    with tab2:
+    else:
         st.subheader("🎯 How It Works")
         
         col1, col2, col3 = st.columns(3)
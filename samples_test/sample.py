@@ -1,10 +1,11 @@
 # Sample Python Code for Testing
 
+import math
+
+
 def calculate_factorial(n):
     """Calculate factorial of a number"""
-    if n == 0 or n == 1:
-        return 1
-    return n * calculate_factorial(n - 1)
+    return math.factorial(n)
 
 
 class Calculator:
@@ -27,12 +28,17 @@ class Calculator:
 
 def main():
     calc = Calculator()
-    print(f"5 + 3 = {calc.add(5, 3)}")
-    print(f"5 - 3 = {calc.subtract(5, 3)}")
-    print(f"5 * 3 = {calc.multiply(5, 3)}")
-    print(f"5 / 3 = {calc.divide(5, 3)}")
+    lines = [
+        f"5 + 3 = {calc.add(5, 3)}",
+        f"5 - 3 = {calc.subtract(5, 3)}",
+        f"5 * 3 = {calc.multiply(5, 3)}",
+        f"5 / 3 = {calc.divide(5, 3)}",
+        "",
+        f"Factorial of 5 = {calculate_factorial(5)}",
+    ]
     
-    print(f"\nFactorial of 5 = {calculate_factorial(5)}")
+    # One write instead of a stdout lock and flush per line
+    print("\n".join(lines))
 
 
 if __name__ == "__main__":